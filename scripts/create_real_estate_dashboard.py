@@ -9,53 +9,69 @@ Project: Real Estate Investment Analysis Platform
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Batch rendering straight to file, no GUI event loop
 import matplotlib.pyplot as plt
 import seaborn as sns
 import sqlite3
 import requests
 import json
-from datetime import datetime, timedelta
-import warnings
-warnings.filterwarnings('ignore')
 
 # Set visualization style
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+# Sample data lookup tables (base price varies by city)
+BASE_PRICES = {
+    'Austin': 400000, 'Denver': 450000, 'Phoenix': 350000, 'Atlanta': 280000,
+    'Nashville': 320000, 'Charlotte': 290000, 'Tampa': 300000, 'Orlando': 280000,
+    'Las Vegas': 380000, 'Sacramento': 480000, 'Oklahoma City': 180000, 'Kansas City': 200000
+}
+STREETS = np.array(['Main', 'Oak', 'Pine', 'Elm', 'Cedar', 'Park', 'First', 'Second'])
+SUFFIXES = np.array(['St', 'Ave', 'Dr', 'Ln', 'Ct'])
+PROP_TYPES = np.array(['Single Family', 'Townhouse', 'Condo'])
+PROP_TYPE_P = np.array([0.7, 0.2, 0.1])
+
+PROPERTIES_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS properties (
+    property_id INTEGER PRIMARY KEY,
+    address TEXT,
+    city TEXT,
+    state TEXT,
+    zip_code TEXT,
+    price REAL,
+    bedrooms INTEGER,
+    bathrooms REAL,
+    square_feet INTEGER,
+    property_type TEXT,
+    estimated_rental_income REAL,
+    property_taxes REAL,
+    listing_date DATE,
+    days_on_market INTEGER,
+    price_per_sqft REAL
+)
+'''
 
 class RealEstateAnalyzer:
     def __init__(self):
         """Initialize the Real Estate Analyzer with API configurations"""
         self.db_name = 'data/real_estate.db'
+        
+        # One connection for the analyzer's lifetime; transactions are managed explicitly
+        self.conn = sqlite3.connect(self.db_name, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')  # Persists in the file, halves fsyncs on bulk writes
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
         self.setup_database()
         
     def setup_database(self):
         """Create SQLite database and tables for real estate data"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         # Create properties table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS properties (
-            property_id INTEGER PRIMARY KEY,
-            address TEXT,
-            city TEXT,
-            state TEXT,
-            zip_code TEXT,
-            price REAL,
-            bedrooms INTEGER,
-            bathrooms REAL,
-            square_feet INTEGER,
-            property_type TEXT,
-            estimated_rental_income REAL,
-            property_taxes REAL,
-            listing_date DATE,
-            days_on_market INTEGER,
-            price_per_sqft REAL
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        cursor.execute(PROPERTIES_TABLE_SQL)
+        
         print("[OK] Database initialized successfully")
         
     def fetch_sample_data(self):
@@ -71,269 +87,301 @@ class RealEstateAnalyzer:
             ('Las Vegas', 'NV'), ('Sacramento', 'CA'), ('Oklahoma City', 'OK'), ('Kansas City', 'MO')
         ]
         
-        properties = []
-        property_id = 1
-        
-        for city, state in cities:
-            # Generate 15-25 properties per city
-            num_properties = np.random.randint(15, 26)
-            
-            for _ in range(num_properties):
-                # Base price varies by city
-                base_price_map = {
-                    'Austin': 400000, 'Denver': 450000, 'Phoenix': 350000, 'Atlanta': 280000,
-                    'Nashville': 320000, 'Charlotte': 290000, 'Tampa': 300000, 'Orlando': 280000,
-                    'Las Vegas': 380000, 'Sacramento': 480000, 'Oklahoma City': 180000, 'Kansas City': 200000
-                }
-                
-                base_price = base_price_map.get(city, 300000)
-                
-                # Property characteristics
-                bedrooms = np.random.choice([2, 3, 4, 5], p=[0.2, 0.4, 0.3, 0.1])
-                bathrooms = np.random.choice([1, 1.5, 2, 2.5, 3, 3.5], p=[0.1, 0.15, 0.3, 0.2, 0.2, 0.05])
-                square_feet = int(np.random.normal(1200 + bedrooms * 300, 200))
-                
-                # Price calculation with some randomness
-                price_variation = np.random.normal(1.0, 0.25)
-                size_multiplier = square_feet / 1500  # Normalize around 1500 sqft
-                price = int(base_price * price_variation * size_multiplier)
-                price = max(price, 50000)  # Minimum price
-                
-                # Rental income estimation (1-2% of property value monthly)
-                rental_yield = np.random.uniform(0.008, 0.02)
-                estimated_rental = int(price * rental_yield)
-                
-                # Property taxes (0.8-2.5% annually)
-                property_tax_rate = np.random.uniform(0.008, 0.025)
-                property_taxes = int(price * property_tax_rate)
-                
-                # Days on market
-                days_on_market = int(np.random.exponential(45))
-                
-                # Listing date (within last 18 months)
-                days_ago = np.random.randint(1, 550)
-                listing_date = datetime.now() - timedelta(days=days_ago)
-                
-                property_data = {
-                    'property_id': property_id,
-                    'address': f"{np.random.randint(100, 9999)} {np.random.choice(['Main', 'Oak', 'Pine', 'Elm', 'Cedar', 'Park', 'First', 'Second'])} {np.random.choice(['St', 'Ave', 'Dr', 'Ln', 'Ct'])}",
-                    'city': city,
-                    'state': state,
-                    'zip_code': f"{np.random.randint(10000, 99999)}",
-                    'price': price,
-                    'bedrooms': bedrooms,
-                    'bathrooms': bathrooms,
-                    'square_feet': square_feet,
-                    'property_type': np.random.choice(['Single Family', 'Townhouse', 'Condo'], p=[0.7, 0.2, 0.1]),
-                    'estimated_rental_income': estimated_rental,
-                    'property_taxes': property_taxes,
-                    'listing_date': listing_date.strftime('%Y-%m-%d'),
-                    'days_on_market': days_on_market,
-                    'price_per_sqft': round(price / square_feet, 2)
-                }
-                
-                properties.append(property_data)
-                property_id += 1
+        # Generate 15-25 properties per city, one row per property in city order
+        num_per_city = np.random.randint(15, 26, size=len(cities))
+        total = int(num_per_city.sum())
+        city_idx = np.repeat(np.arange(len(cities)), num_per_city)
+        
+        city_names = np.array([city for city, _ in cities])
+        state_codes = np.array([state for _, state in cities])
+        base_prices = np.array([BASE_PRICES.get(city, 300000) for city, _ in cities])[city_idx]
+        
+        # Property characteristics
+        bedrooms = np.random.choice([2, 3, 4, 5], size=total, p=[0.2, 0.4, 0.3, 0.1]).astype(np.int32)
+        bathrooms = np.random.choice([1, 1.5, 2, 2.5, 3, 3.5], size=total,
+                                     p=[0.1, 0.15, 0.3, 0.2, 0.2, 0.05]).astype(np.float32)
+        square_feet = np.random.normal(1200 + bedrooms * 300, 200, size=total).astype(np.int32)
+        property_types = np.random.choice(PROP_TYPES, size=total, p=PROP_TYPE_P)
+        
+        # Price calculation with some randomness
+        price_variation = np.random.normal(1.0, 0.25, size=total)
+        size_multiplier = square_feet / 1500  # Normalize around 1500 sqft
+        price = (base_prices * price_variation * size_multiplier).astype(np.int64)
+        price = np.maximum(price, 50000)  # Minimum price
+        
+        # Rental income estimation (1-2% of property value monthly)
+        rental_yield = np.random.uniform(0.008, 0.02, size=total)
+        estimated_rental = (price * rental_yield).astype(np.int64)
+        
+        # Property taxes (0.8-2.5% annually)
+        property_tax_rate = np.random.uniform(0.008, 0.025, size=total)
+        property_taxes = (price * property_tax_rate).astype(np.int32)
+        
+        # Days on market
+        days_on_market = np.random.exponential(45, size=total).astype(np.int32)
+        
+        # Listing date (within last 18 months)
+        days_ago = np.random.randint(1, 550, size=total)
+        listing_date = pd.to_datetime(np.datetime64('today') - days_ago.astype('timedelta64[D]'))
+        
+        # Street addresses and zip codes, templated with fixed-width NumPy string ops
+        street_numbers = np.random.randint(100, 9999, size=total).astype('<U4')
+        street_names = np.random.choice(STREETS, size=total)
+        street_suffixes = np.random.choice(SUFFIXES, size=total)
+        addresses = np.char.add(np.char.add(street_numbers, ' '), np.char.add(np.char.add(street_names, ' '), street_suffixes))
+        zip_codes = np.random.randint(10000, 99999, size=total).astype('<U5')
         
         # Save to database
-        df = pd.DataFrame(properties)
-        conn = sqlite3.connect(self.db_name)
-        df.to_sql('properties', conn, if_exists='replace', index=False)
-        conn.close()
-        
-        print(f"[OK] Generated {len(properties)} sample properties across {len(cities)} cities")
+        df = pd.DataFrame({
+            'property_id': np.arange(1, total + 1, dtype=np.int32),
+            'address': addresses.astype(object),
+            'city': pd.Categorical.from_codes(city_idx, categories=city_names),
+            'state': pd.Categorical(state_codes[city_idx]),
+            'zip_code': zip_codes.astype(object),
+            'price': price,
+            'bedrooms': bedrooms,
+            'bathrooms': bathrooms,
+            'square_feet': square_feet,
+            'property_type': pd.Categorical(property_types),
+            'estimated_rental_income': estimated_rental,
+            'property_taxes': property_taxes,
+            'listing_date': listing_date,
+            'days_on_market': days_on_market,
+            'price_per_sqft': np.round(price / square_feet, 2)
+        })
+        # Rebuild the table (older databases may carry a different schema) and
+        # reload it in a single transaction with one batched insert
+        rows = df.assign(listing_date=df['listing_date'].dt.strftime('%Y-%m-%d'))
+        columns = ', '.join(df.columns)
+        placeholders = ', '.join('?' * len(df.columns))
+        # The connection context commits on success and rolls back if any statement fails
+        self.conn.execute('BEGIN')
+        with self.conn:
+            self.conn.execute('DROP TABLE IF EXISTS properties')
+            self.conn.execute(PROPERTIES_TABLE_SQL)
+            self.conn.executemany(f'INSERT INTO properties ({columns}) VALUES ({placeholders})',
+                                  rows.itertuples(index=False, name=None))
+        
+        print(f"[OK] Generated {len(df)} sample properties across {len(cities)} cities")
         return df
     
+    def close(self):
+        """Close the analyzer's database connection"""
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def create_investment_dashboard(self, df):
         """Create comprehensive real estate investment analysis dashboard"""
         print("[INFO] Creating Real Estate Investment Dashboard...")
         
         # Set up the figure with subplots
-        fig = plt.figure(figsize=(20, 16))
+        fig, axes = plt.subplots(3, 4, figsize=(20, 16))
         fig.suptitle('Real Estate Investment Analysis Dashboard\nComprehensive Market Intelligence & Investment Opportunities', 
                      fontsize=20, fontweight='bold', y=0.98)
         
+        # Group keys as categoricals so groupby hashes integer codes, not strings
+        for col in ('city', 'state', 'property_type'):
+            df[col] = df[col].astype('category')
+        
         # Calculate investment metrics
-        df['annual_rental'] = df['estimated_rental_income'] * 12
-        df['cap_rate'] = (df['annual_rental'] / df['price'] * 100).round(2)
-        df['monthly_cash_flow'] = (
-            df['estimated_rental_income'] - 
-            (df['price'] * 0.80 * 0.045 / 12) -  # Mortgage payment (4.5% interest)
-            (df['property_taxes'] / 12) -         # Monthly taxes
-            (df['estimated_rental_income'] * 0.1) # Maintenance reserve
-        ).round(0)
+        price = df['price'].to_numpy()
+        rent = df['estimated_rental_income'].to_numpy()
+        tax = df['property_taxes'].to_numpy()
+        annual_rental = rent * 12
+        df['annual_rental'] = annual_rental
+        df['cap_rate'] = np.round(annual_rental / price * 100, 2)
+        df['monthly_cash_flow'] = np.round(
+            rent * 0.9 -                   # Rent less 10% maintenance reserve
+            price * (0.80 * 0.045 / 12) -  # Mortgage payment (4.5% interest)
+            tax / 12,                      # Monthly taxes
+            0)
+        
+        # Positive cash flow mask, shared by the scatter, the KPI panel and the executive summary
+        pos_mask = df['monthly_cash_flow'].to_numpy() > 0
+        n_pos = int(pos_mask.sum())
+        
+        # Group once per key and aggregate everything the panels need in a single pass
+        gb_state = df.groupby('state', observed=True, sort=False)
+        gb_city = df.groupby('city', observed=True, sort=False)
+        gb_ptype = df.groupby('property_type', observed=True, sort=False)
+        state_stats = gb_state.agg(price=('price', 'mean'),
+                                   cap=('cap_rate', 'mean'),
+                                   cash=('monthly_cash_flow', 'mean'))
+        city_stats = gb_city.agg(price_per_sqft=('price_per_sqft', 'mean'),
+                                 dom=('days_on_market', 'mean'),
+                                 cap=('cap_rate', 'mean'),
+                                 vol=('price', 'std'))
         
         # 1. Price Distribution by State
-        plt.subplot(3, 4, 1)
-        state_avg = df.groupby('state')['price'].mean().sort_values(ascending=False)
-        bars = plt.bar(state_avg.index, state_avg.values / 1000, color='steelblue', alpha=0.8)
-        plt.title('Average Property Price by State', fontweight='bold', fontsize=12)
-        plt.xlabel('State')
-        plt.ylabel('Price ($000s)')
-        plt.xticks(rotation=45)
+        ax = axes[0, 0]
+        state_avg = state_stats['price'].sort_values(ascending=False)
+        bars = ax.bar(state_avg.index, state_avg.to_numpy() / 1000, color='steelblue', alpha=0.8)
+        ax.set_title('Average Property Price by State', fontweight='bold', fontsize=12)
+        ax.set_xlabel('State')
+        ax.set_ylabel('Price ($000s)')
+        ax.tick_params(axis='x', rotation=45)
         
         # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + 5,
-                    f'${height:.0f}K', ha='center', va='bottom', fontsize=9)
+        ax.bar_label(bars, labels=[f'${h:.0f}K' for h in state_avg.to_numpy() / 1000],
+                     padding=3, fontsize=9)
         
         # 2. Cap Rate Distribution
-        plt.subplot(3, 4, 2)
-        plt.hist(df['cap_rate'], bins=20, color='lightgreen', alpha=0.7, edgecolor='black')
-        plt.axvline(df['cap_rate'].median(), color='red', linestyle='--', 
+        ax = axes[0, 1]
+        ax.hist(df['cap_rate'], bins=20, color='lightgreen', alpha=0.7, edgecolor='black')
+        ax.axvline(df['cap_rate'].median(), color='red', linestyle='--', 
                    label=f'Median: {df["cap_rate"].median():.1f}%')
-        plt.title('Cap Rate Distribution', fontweight='bold', fontsize=12)
-        plt.xlabel('Cap Rate (%)')
-        plt.ylabel('Number of Properties')
-        plt.legend()
+        ax.set_title('Cap Rate Distribution', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Cap Rate (%)')
+        ax.set_ylabel('Number of Properties')
+        ax.legend()
         
         # 3. Price per Square Foot Analysis
-        plt.subplot(3, 4, 3)
-        city_price_sqft = df.groupby('city')['price_per_sqft'].mean().sort_values(ascending=False).head(8)
-        bars = plt.barh(city_price_sqft.index, city_price_sqft.values, color='coral', alpha=0.8)
-        plt.title('Price per Sq Ft by Top Cities', fontweight='bold', fontsize=12)
-        plt.xlabel('Price per Sq Ft ($)')
+        ax = axes[0, 2]
+        city_price_sqft = city_stats['price_per_sqft'].sort_values(ascending=False).head(8)
+        bars = ax.barh(city_price_sqft.index, city_price_sqft.to_numpy(), color='coral', alpha=0.8)
+        ax.set_title('Price per Sq Ft by Top Cities', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Price per Sq Ft ($)')
         
         # Add value labels
-        for i, bar in enumerate(bars):
-            width = bar.get_width()
-            plt.text(width + 2, bar.get_y() + bar.get_height()/2,
-                    f'${width:.0f}', ha='left', va='center', fontsize=9)
+        ax.bar_label(bars, labels=[f'${w:.0f}' for w in city_price_sqft.to_numpy()],
+                     padding=3, fontsize=9)
         
         # 4. Investment Opportunity Heat Map
-        plt.subplot(3, 4, 4)
-        opportunity_data = df.groupby('state').agg({
-            'cap_rate': 'mean',
-            'monthly_cash_flow': 'mean',
-            'price': 'mean'
-        }).round(1)
-        
-        # Create investment score
-        opportunity_data['investment_score'] = (
-            (opportunity_data['cap_rate'] / opportunity_data['cap_rate'].max() * 50) +
-            (opportunity_data['monthly_cash_flow'] / opportunity_data['monthly_cash_flow'].max() * 30) +
-            ((1 / (opportunity_data['price'] / opportunity_data['price'].min())) * 20)
-        ).round(1)
-        
-        bars = plt.bar(opportunity_data.index, opportunity_data['investment_score'], 
+        ax = axes[0, 3]
+        opportunity_data = state_stats.sort_index().round(1)
+        
+        # Create investment score in one expression over the cap/cash/price columns
+        arr = opportunity_data[['cap', 'cash', 'price']].to_numpy()
+        score = (arr[:, 0] / arr[:, 0].max() * 50 +
+                 arr[:, 1] / arr[:, 1].max() * 30 +
+                 arr[:, 2].min() / arr[:, 2] * 20)
+        opportunity_data['investment_score'] = score.round(1)
+        
+        bars = ax.bar(opportunity_data.index, opportunity_data['investment_score'], 
                       color='gold', alpha=0.8)
-        plt.title('Investment Opportunity Score by State', fontweight='bold', fontsize=12)
-        plt.xlabel('State')
-        plt.ylabel('Investment Score')
-        plt.xticks(rotation=45)
+        ax.set_title('Investment Opportunity Score by State', fontweight='bold', fontsize=12)
+        ax.set_xlabel('State')
+        ax.set_ylabel('Investment Score')
+        ax.tick_params(axis='x', rotation=45)
         
         # 5. Cash Flow Analysis
-        plt.subplot(3, 4, 5)
-        cash_flow_positive = df[df['monthly_cash_flow'] > 0]
-        plt.scatter(cash_flow_positive['price'], cash_flow_positive['monthly_cash_flow'], 
-                   alpha=0.6, c=cash_flow_positive['cap_rate'], cmap='viridis')
-        plt.colorbar(label='Cap Rate (%)')
-        plt.title('Cash Flow vs Property Price', fontweight='bold', fontsize=12)
-        plt.xlabel('Property Price ($)')
-        plt.ylabel('Monthly Cash Flow ($)')
+        ax = axes[1, 0]
+        pos_price = price[pos_mask]
+        pos_cash_flow = df['monthly_cash_flow'].to_numpy()[pos_mask]
+        pos_cap_rate = df['cap_rate'].to_numpy()[pos_mask]
+        scatter = ax.scatter(pos_price, pos_cash_flow, 
+                             alpha=0.6, c=pos_cap_rate, cmap='viridis', rasterized=True)
+        fig.colorbar(scatter, ax=ax, label='Cap Rate (%)')
+        ax.set_title('Cash Flow vs Property Price', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Property Price ($)')
+        ax.set_ylabel('Monthly Cash Flow ($)')
         
         # 6. Market Velocity (Days on Market)
-        plt.subplot(3, 4, 6)
-        city_dom = df.groupby('city')['days_on_market'].mean().sort_values().head(8)
-        colors = ['red' if x < 30 else 'orange' if x < 60 else 'green' for x in city_dom.values]
-        bars = plt.barh(city_dom.index, city_dom.values, color=colors, alpha=0.7)
-        plt.title('Market Velocity (Days on Market)', fontweight='bold', fontsize=12)
-        plt.xlabel('Average Days on Market')
+        ax = axes[1, 1]
+        city_dom = city_stats['dom'].sort_values().head(8)
+        dom = city_dom.to_numpy()
+        velocity = [dom < 30, dom < 60]
+        colors = np.select(velocity, ['red', 'orange'], 'green')
+        market_types = np.select(velocity, ['Hot', 'Warm'], 'Cool')
+        bars = ax.barh(city_dom.index, dom, color=colors, alpha=0.7)
+        ax.set_title('Market Velocity (Days on Market)', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Average Days on Market')
         
         # Add velocity indicators
-        for i, bar in enumerate(bars):
-            width = bar.get_width()
-            market_type = 'Hot' if width < 30 else 'Warm' if width < 60 else 'Cool'
-            plt.text(width + 1, bar.get_y() + bar.get_height()/2,
-                    f'{width:.0f} ({market_type})', ha='left', va='center', fontsize=8)
+        ax.bar_label(bars, labels=[f'{w:.0f} ({t})' for w, t in zip(dom, market_types)],
+                     padding=3, fontsize=8)
         
         # 7. Property Size vs Rental Yield
-        plt.subplot(3, 4, 7)
-        rental_yield = (df['annual_rental'] / df['price'] * 100)
-        size_bins = pd.cut(df['square_feet'], bins=[0, 1000, 1500, 2000, 5000], 
-                          labels=['<1000', '1000-1500', '1500-2000', '>2000'])
-        size_yield = df.groupby(size_bins)['cap_rate'].mean()
-        
-        bars = plt.bar(size_yield.index, size_yield.values, color='lightblue', alpha=0.8)
-        plt.title('Rental Yield by Property Size', fontweight='bold', fontsize=12)
-        plt.xlabel('Square Feet')
-        plt.ylabel('Average Cap Rate (%)')
+        ax = axes[1, 2]
+        # Bucket with searchsorted and average with weighted bincount (right-inclusive like pd.cut)
+        size_idx = np.searchsorted([1000, 1500, 2000], df['square_feet'].to_numpy())
+        size_sums = np.bincount(size_idx, weights=df['cap_rate'].to_numpy(), minlength=4)
+        size_counts = np.bincount(size_idx, minlength=4)
+        size_yield = pd.Series(size_sums / np.maximum(size_counts, 1),
+                               index=['<1000', '1000-1500', '1500-2000', '>2000'])
+        
+        bars = ax.bar(size_yield.index, size_yield.to_numpy(), color='lightblue', alpha=0.8)
+        ax.set_title('Rental Yield by Property Size', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Square Feet')
+        ax.set_ylabel('Average Cap Rate (%)')
         
         # 8. Top Investment Properties
-        plt.subplot(3, 4, 8)
+        ax = axes[1, 3]
         # Create simple investment score
         df['simple_score'] = (df['cap_rate'] * 0.4 + 
                              (df['monthly_cash_flow'] / df['monthly_cash_flow'].max() * 10) * 0.6)
         
         top_properties = df.nlargest(5, 'simple_score')[['city', 'state', 'simple_score']]
-        top_properties['location'] = top_properties['city'] + ', ' + top_properties['state']
+        top_properties['location'] = top_properties['city'].astype(str) + ', ' + top_properties['state'].astype(str)
         
-        bars = plt.barh(top_properties['location'], top_properties['simple_score'], 
+        bars = ax.barh(top_properties['location'], top_properties['simple_score'], 
                        color='purple', alpha=0.7)
-        plt.title('Top 5 Investment Markets', fontweight='bold', fontsize=12)
-        plt.xlabel('Investment Score')
+        ax.set_title('Top 5 Investment Markets', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Investment Score')
         
         # 9. Monthly Trends (Simulated)
-        plt.subplot(3, 4, 9)
+        ax = axes[2, 0]
         # Create monthly trend simulation
-        months = pd.date_range(start='2023-01-01', periods=12, freq='M')
-        price_trend = [300000 + i*5000 + np.random.normal(0, 15000) for i in range(12)]
+        months = pd.date_range(start='2023-01-01', periods=12, freq='MS')
+        price_trend = 300000 + np.arange(12)*5000 + np.random.normal(0, 15000, 12)
         
-        plt.plot(months, price_trend, marker='o', linewidth=2, color='darkgreen')
-        plt.title('Average Price Trend (12 Months)', fontweight='bold', fontsize=12)
-        plt.xlabel('Month')
-        plt.ylabel('Average Price ($)')
-        plt.xticks(rotation=45)
-        plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x/1000:.0f}K'))
+        ax.plot(months, price_trend, marker='o', linewidth=2, color='darkgreen')
+        ax.set_title('Average Price Trend (12 Months)', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Month')
+        ax.set_ylabel('Average Price ($)')
+        ax.tick_params(axis='x', rotation=45)
+        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x/1000:.0f}K'))
         
         # 10. ROI Comparison
-        plt.subplot(3, 4, 10)
-        roi_comparison = df.groupby('property_type').agg({
+        ax = axes[2, 1]
+        roi_comparison = gb_ptype.agg({
             'cap_rate': 'mean',
             'monthly_cash_flow': 'mean'
-        }).round(1)
+        }).sort_index().round(1)
         
         x = np.arange(len(roi_comparison.index))
         width = 0.35
         
-        plt.bar(x - width/2, roi_comparison['cap_rate'], width, label='Cap Rate (%)', alpha=0.8)
-        plt.bar(x + width/2, roi_comparison['monthly_cash_flow']/50, width, 
+        ax.bar(x - width/2, roi_comparison['cap_rate'], width, label='Cap Rate (%)', alpha=0.8)
+        ax.bar(x + width/2, roi_comparison['monthly_cash_flow']/50, width, 
                label='Cash Flow ($50s)', alpha=0.8)
         
-        plt.title('ROI Metrics by Property Type', fontweight='bold', fontsize=12)
-        plt.xlabel('Property Type')
-        plt.xticks(x, roi_comparison.index, rotation=45)
-        plt.legend()
+        ax.set_title('ROI Metrics by Property Type', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Property Type')
+        ax.set_xticks(x)
+        ax.set_xticklabels(roi_comparison.index, rotation=45)
+        ax.legend()
         
         # 11. Risk vs Return Analysis
-        plt.subplot(3, 4, 11)
+        ax = axes[2, 2]
         # Calculate risk (price volatility) and return (cap rate) by city
-        city_metrics = df.groupby('city').agg({
-            'cap_rate': 'mean',
-            'price': 'std'  # Price standard deviation as risk proxy
-        }).fillna(0)
+        # Price standard deviation as risk proxy
+        cm = city_stats[['vol', 'cap']].fillna(0).to_numpy()
         
-        plt.scatter(city_metrics['price']/1000, city_metrics['cap_rate'], 
-                   s=100, alpha=0.7, c=city_metrics['cap_rate'], cmap='RdYlGn')
-        plt.colorbar(label='Cap Rate (%)')
-        plt.title('Risk vs Return Analysis', fontweight='bold', fontsize=12)
-        plt.xlabel('Price Volatility ($000s)')
-        plt.ylabel('Average Cap Rate (%)')
+        scatter = ax.scatter(cm[:, 0]/1000, cm[:, 1], 
+                             s=100, alpha=0.7, c=cm[:, 1], cmap='RdYlGn', rasterized=True)
+        fig.colorbar(scatter, ax=ax, label='Cap Rate (%)')
+        ax.set_title('Risk vs Return Analysis', fontweight='bold', fontsize=12)
+        ax.set_xlabel('Price Volatility ($000s)')
+        ax.set_ylabel('Average Cap Rate (%)')
         
         # 12. Key Performance Indicators
-        plt.subplot(3, 4, 12)
-        plt.axis('off')  # Turn off axis for text display
+        ax = axes[2, 3]
+        ax.axis('off')  # Turn off axis for text display
         
         # Calculate KPIs
         total_properties = len(df)
         avg_price = df['price'].mean()
         avg_cap_rate = df['cap_rate'].mean()
-        positive_cash_flow = len(df[df['monthly_cash_flow'] > 0])
-        cash_flow_rate = (positive_cash_flow / total_properties * 100)
+        cash_flow_rate = (n_pos / total_properties * 100)
         
         kpi_text = f"""
-        📊 KEY PERFORMANCE INDICATORS
+        [KPI] KEY PERFORMANCE INDICATORS
         
         Total Properties Analyzed: {total_properties:,}
         
@@ -341,19 +389,19 @@ class RealEstateAnalyzer:
         
         [METRIC] Average Cap Rate: {avg_cap_rate:.1f}%
         
-        [CASH] Positive Cash Flow Properties: {positive_cash_flow}
+        [CASH] Positive Cash Flow Properties: {n_pos}
            ({cash_flow_rate:.1f}% of total)
         
-        🏆 Top Performing State: {opportunity_data['investment_score'].idxmax()}
+        [TOP] Top Performing State: {opportunity_data['investment_score'].idxmax()}
            (Score: {opportunity_data['investment_score'].max():.1f})
         
-        ⚡ Fastest Moving Market: {city_dom.index[0]}
+        [FAST] Fastest Moving Market: {city_dom.index[0]}
            ({city_dom.iloc[0]:.0f} days avg)
         
-        🎯 Best Cash Flow Property: ${df['monthly_cash_flow'].max():,.0f}/month
+        [BEST] Best Cash Flow Property: ${df['monthly_cash_flow'].max():,.0f}/month
         """
         
-        plt.text(0.05, 0.95, kpi_text, transform=plt.gca().transAxes, fontsize=11,
+        ax.text(0.05, 0.95, kpi_text, transform=ax.transAxes, fontsize=11,
                 verticalalignment='top', fontfamily='monospace',
                 bbox=dict(boxstyle='round,pad=0.5', facecolor='lightgray', alpha=0.8))
         
@@ -363,17 +411,19 @@ class RealEstateAnalyzer:
         
         # Save dashboard
         dashboard_path = 'images/dashboards/real_estate_dashboard.png'
-        plt.savefig(dashboard_path, dpi=300, bbox_inches='tight', 
-                   facecolor='white', edgecolor='none')
+        plt.savefig(dashboard_path, dpi=150, bbox_inches='tight', 
+                   facecolor='white', edgecolor='none', pil_kwargs={'compress_level': 1})
         print(f"[OK] Dashboard saved: {dashboard_path}")
+        plt.close(fig)
         
         # Create executive summary
-        self.create_executive_summary(df, opportunity_data)
+        self.create_executive_summary(df, opportunity_data, n_pos)
         
-        plt.show()
-        
-    def create_executive_summary(self, df, opportunity_data):
+    def create_executive_summary(self, df, opportunity_data, n_pos=None):
         """Create executive summary visualization"""
+        if n_pos is None:
+            n_pos = int((df['monthly_cash_flow'].to_numpy() > 0).sum())
+        
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('Real Estate Investment Analysis - Executive Summary\nStrategic Investment Insights & Market Intelligence', 
                      fontsize=16, fontweight='bold')
@@ -386,19 +436,15 @@ class RealEstateAnalyzer:
         ax1.set_ylabel('Investment Score')
         
         # Add value labels
-        for bar in bars1:
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
-                    f'{height:.1f}', ha='center', va='bottom', fontweight='bold')
+        ax1.bar_label(bars1, fmt='%.1f', padding=3, fontweight='bold')
         
         # 2. Portfolio Allocation Recommendation  
-        cash_flow_tiers = pd.cut(df['monthly_cash_flow'], 
-                                bins=[-np.inf, 0, 200, 500, np.inf],
-                                labels=['Negative', 'Low (0-$200)', 'Medium ($200-$500)', 'High ($500+)'])
-        tier_counts = cash_flow_tiers.value_counts()
+        tier_idx = np.searchsorted([0, 200, 500], df['monthly_cash_flow'].to_numpy())
+        tier_counts = pd.Series(np.bincount(tier_idx, minlength=4),
+                                index=['Negative', 'Low (0-$200)', 'Medium ($200-$500)', 'High ($500+)'])
         
         colors = ['red', 'orange', 'lightgreen', 'darkgreen']
-        wedges, texts, autotexts = ax2.pie(tier_counts.values, labels=None, 
+        wedges, texts, autotexts = ax2.pie(tier_counts.to_numpy(), labels=None, 
                                           colors=colors, autopct='%1.1f%%', startangle=90,
                                           pctdistance=0.85)
         
@@ -415,7 +461,7 @@ class RealEstateAnalyzer:
         
         # 3. Geographic Diversification
         state_counts = df['state'].value_counts().head(8)
-        bars3 = ax3.barh(state_counts.index, state_counts.values, 
+        bars3 = ax3.barh(state_counts.index, state_counts.to_numpy(), 
                         color='steelblue', alpha=0.7)
         ax3.set_title('Market Coverage by State\n(Property Count)', fontweight='bold')
         ax3.set_xlabel('Number of Properties')
@@ -423,7 +469,14 @@ class RealEstateAnalyzer:
         # 4. Key Metrics Summary Table
         ax4.axis('off')
         
-        # Calculate summary metrics
+        # Calculate summary metrics in one multi-column aggregation
+        stats = df.agg({
+            'price': ['mean', 'min', 'max'],
+            'cap_rate': 'mean',
+            'monthly_cash_flow': 'median',
+            'days_on_market': 'mean'
+        })
+        
         metrics_data = {
             'Metric': [
                 'Total Investment Universe',
@@ -437,13 +490,13 @@ class RealEstateAnalyzer:
             ],
             'Value': [
                 f"{len(df):,} properties",
-                f"${df['price'].mean():,.0f}",
-                f"{df['cap_rate'].mean():.1f}%",
-                f"${df['monthly_cash_flow'].median():,.0f}/month",
-                f"{len(df[df['monthly_cash_flow'] > 0])} ({len(df[df['monthly_cash_flow'] > 0])/len(df)*100:.1f}%)",
+                f"${stats.at['mean', 'price']:,.0f}",
+                f"{stats.at['mean', 'cap_rate']:.1f}%",
+                f"${stats.at['median', 'monthly_cash_flow']:,.0f}/month",
+                f"{n_pos} ({n_pos/len(df)*100:.1f}%)",
                 f"{opportunity_data['investment_score'].idxmax()}",
-                f"{df['days_on_market'].mean():.0f} days",
-                f"${df['price'].min():,.0f} - ${df['price'].max():,.0f}"
+                f"{stats.at['mean', 'days_on_market']:.0f} days",
+                f"${stats.at['min', 'price']:,.0f} - ${stats.at['max', 'price']:,.0f}"
             ]
         }
         
@@ -476,25 +529,23 @@ class RealEstateAnalyzer:
         
         # Save executive summary
         summary_path = 'images/dashboards/real_estate_executive_summary.png'
-        plt.savefig(summary_path, dpi=300, bbox_inches='tight',
-                   facecolor='white', edgecolor='none')
+        plt.savefig(summary_path, dpi=150, bbox_inches='tight',
+                   facecolor='white', edgecolor='none', pil_kwargs={'compress_level': 1})
         print(f"[OK] Executive Summary saved: {summary_path}")
-        
-        plt.show()
+        plt.close(fig)
 
 def main():
     """Main execution function"""
     print("Real Estate Investment Analysis Platform")
     print("=" * 50)
     
-    # Initialize analyzer
-    analyzer = RealEstateAnalyzer()
-    
-    # Fetch and process data
-    df = analyzer.fetch_sample_data()
-    
-    # Create comprehensive dashboard
-    analyzer.create_investment_dashboard(df)
+    # Initialize analyzer; the connection is closed even if a step fails
+    with RealEstateAnalyzer() as analyzer:
+        # Fetch and process data
+        df = analyzer.fetch_sample_data()
+        
+        # Create comprehensive dashboard
+        analyzer.create_investment_dashboard(df)
     
     print("\n[SUCCESS] Real Estate Investment Analysis Complete!")
     print("=" * 50)